@@ -89,7 +89,7 @@ export const swaggerSpec = swaggerJsdoc({
         },
         post: {
           tags: ['Sessions'], summary: 'Start a new conversation session',
-          requestBody: { required: true, content: { 'application/json': { schema: { type: 'object', required: ['agentId'], properties: { agentId: { type: 'string' }, agentVersionId: { type: 'string' }, environmentId: { type: 'string' }, userId: { type: 'string' }, metadata: { type: 'object' } } } } } },
+          requestBody: { required: true, content: { 'application/json': { schema: { type: 'object', required: ['agentId'], properties: { id: { type: 'string', format: 'uuid', description: 'Optional client-generated id; creating an existing id returns that session' }, agentId: { type: 'string' }, agentVersionId: { type: 'string' }, environmentId: { type: 'string' }, userId: { type: 'string' }, metadata: { type: 'object' } } } } } },
           responses: { 201: { description: 'Session created' } },
         },
       },
@@ -101,6 +101,21 @@ export const swaggerSpec = swaggerJsdoc({
           responses: { 201: { description: 'Turn added' } },
         },
       },
+      '/sessions/bulk': {
+        post: {
+          tags: ['Sessions'], summary: 'Create a session (or append to an existing session.id) with its turns, optionally ending it, in one request',
+          requestBody: { required: true, content: { 'application/json': { schema: { type: 'object', required: ['session'], properties: { session: { type: 'object', description: 'Same shape as POST /sessions' }, turns: { type: 'array', maxItems: 100, items: { type: 'object', description: 'Same shape as POST /sessions/{id}/turns' } }, end: { type: 'object', properties: { status: { type: 'string', default: 'COMPLETED' } } } } } } } },
+          responses: { 201: { description: 'Session with its created turns' }, 404: { description: 'Agent not found' } },
+        },
+      },
+      '/sessions/{id}/turns/batch': {
+        post: {
+          tags: ['Sessions'], summary: 'Append several turns in one request, optionally ending the session',
+          parameters: [{ in: 'path', name: 'id', required: true, schema: { type: 'string' } }],
+          requestBody: { required: true, content: { 'application/json': { schema: { type: 'object', required: ['turns'], properties: { turns: { type: 'array', maxItems: 100, items: { type: 'object', description: 'Same shape as POST /sessions/{id}/turns' } }, end: { type: 'object', properties: { status: { type: 'string', default: 'COMPLETED' } } } } } } } },
+          responses: { 201: { description: '{ turns, session }' } },
+        },
+      },
       '/sessions/{id}/end': {
         post: { tags: ['Sessions'], summary: 'End a session (mark COMPLETED)', parameters: [{ in: 'path', name: 'id', required: true, schema: { type: 'string' } }], responses: { 200: { description: 'Session ended' } } },
       },
@@ -2,30 +2,42 @@ import { Response, NextFunction } from 'express';
 import { prisma } from '../lib/prisma';
 import { AuthRequest } from './auth';
 
+// Write one audit row.  Fire-and-forget: auditing never fails a request.
+export function recordAudit(
+  req: AuthRequest,
+  action: string,
+  resourceType: string,
+  resourceId: string | undefined,
+  after: unknown,
+) {
+  if (!req.user) return;
+  prisma.auditLog
+    .create({
+      data: {
+        orgId: req.user.orgId,
+        userId: req.user.id,
+        action,
+        resourceType,
+        resourceId,
+        before: req.method !== 'POST' ? JSON.stringify(req.body) : undefined,
+        after: JSON.stringify(after),
+        ipAddress: req.ip,
+        userAgent: Array.isArray(req.headers['user-agent'])
+          ? req.headers['user-agent'][0]
+          : req.headers['user-agent'],
+      },
+    })
+    .catch(() => {});
+}
+
 export function auditLog(action: string, resourceType: string) {
   return async (req: AuthRequest, res: Response, next: NextFunction) => {
     const originalJson = res.json.bind(res);
     res.json = function (body: unknown) {
-      if (res.statusCode < 400 && req.user) {
+      if (res.statusCode < 400) {
         const paramId = Array.isArray(req.params.id) ? req.params.id[0] : req.params.id;
         const bodyId = (body as Record<string, string>)?.id;
-        prisma.auditLog
-          .create({
-            data: {
-              orgId: req.user.orgId,
-              userId: req.user.id,
-              action,
-              resourceType,
-              resourceId: (paramId ?? bodyId) || undefined,
-              before: req.method !== 'POST' ? JSON.stringify(req.body) : undefined,
-              after: JSON.stringify(body),
-              ipAddress: req.ip,
-              userAgent: Array.isArray(req.headers['user-agent'])
-                ? req.headers['user-agent'][0]
-                : req.headers['user-agent'],
-            },
-          })
-          .catch(() => {});
+        recordAudit(req, action, resourceType, (paramId ?? bodyId) || undefined, body);
       }
       return originalJson(body);
     };
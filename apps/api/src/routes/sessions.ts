@@ -3,7 +3,7 @@ import { z } from 'zod';
 import jwt from 'jsonwebtoken';
 import { prisma } from '../lib/prisma';
 import { authenticate, AuthRequest } from '../middleware/auth';
-import { auditLog } from '../middleware/audit';
+import { auditLog, recordAudit } from '../middleware/audit';
 import { estimateCost } from '../lib/pricing';
 
 import type { IRouter } from 'express';
@@ -147,6 +147,9 @@ sessionsRouter.get('/:id', async (req: AuthRequest, res, next) => {
 });
 
 const createSchema = z.object({
+  // Optional client-generated id, so SDKs can use the session before the
+  // create has returned.  Creating an existing id is idempotent.
+  id: z.string().uuid().optional(),
   agentId: z.string(),
   agentVersionId: z.string().optional(),
   environmentId: z.string().optional(),
@@ -156,23 +159,39 @@ const createSchema = z.object({
   tags: z.array(z.string()).default([]),
 });
 
-sessionsRouter.post('/', auditLog('session.create', 'Session'), async (req: AuthRequest, res, next) => {
+function sessionData(body: z.infer<typeof createSchema>) {
+  return {
+    ...(body.id && { id: body.id }),
+    agentId: body.agentId,
+    agentVersionId: body.agentVersionId,
+    environmentId: body.environmentId,
+    externalId: body.externalId,
+    userId: body.userId,
+    metadata: JSON.stringify(body.metadata),
+    tags: JSON.stringify(body.tags),
+  };
+}
+
+// Look up the session named by a client-supplied id, in any org — callers
+// must reject ids that belong to another org.
+function findClientSession(id: string | undefined) {
+  return id ? prisma.session.findUnique({ where: { id }, include: { agent: true } }) : null;
+}
+
+sessionsRouter.post('/', async (req: AuthRequest, res, next) => {
   try {
     const body = createSchema.parse(req.body);
     const agent = await prisma.agent.findFirst({ where: { id: body.agentId, orgId: req.user!.orgId } });
     if (!agent) { res.status(404).json({ error: 'Agent not found' }); return; }
+    const existing = await findClientSession(body.id);
+    if (existing && existing.agent.orgId !== req.user!.orgId) { res.status(409).json({ error: 'Session id already in use' }); return; }
+    // Re-creating a client-supplied id is a no-op, so only a new session is audited
+    if (existing) { res.json(existing); return; }
     const session = await prisma.session.create({
-      data: {
-        agentId: body.agentId,
-        agentVersionId: body.agentVersionId,
-        environmentId: body.environmentId,
-        externalId: body.externalId,
-        userId: body.userId,
-        metadata: JSON.stringify(body.metadata),
-        tags: JSON.stringify(body.tags),
-      },
+      data: sessionData(body),
       include: { agent: true },
     });
+    recordAudit(req, 'session.create', 'Session', session.id, session);
     res.status(201).json(session);
   } catch (err) { next(err); }
 });
@@ -187,6 +206,20 @@ const turnSchema = z.object({
   metadata: z.record(z.unknown()).default({}),
 });
 
+function turnData(sessionId: string, body: z.infer<typeof turnSchema>, createdAt?: Date) {
+  return {
+    sessionId,
+    role: body.role,
+    latencyMs: body.latencyMs,
+    inputTokens: body.inputTokens,
+    outputTokens: body.outputTokens,
+    content: typeof body.content === 'string' ? body.content : JSON.stringify(body.content),
+    toolCalls: JSON.stringify(body.toolCalls),
+    metadata: JSON.stringify(body.metadata),
+    ...(createdAt && { createdAt }),
+  };
+}
+
 sessionsRouter.post('/:id/turns', async (req: AuthRequest, res, next) => {
   try {
     const body = turnSchema.parse(req.body);
@@ -195,19 +228,7 @@ sessionsRouter.post('/:id/turns', async (req: AuthRequest, res, next) => {
     });
     if (!session) { res.status(404).json({ error: 'Session not found' }); return; }
     const { id: sessionId } = req.params;
-    const contentValue = typeof body.content === 'string' ? body.content : JSON.stringify(body.content);
-    const turn = await prisma.sessionTurn.create({
-      data: {
-        sessionId,
-        role: body.role,
-        latencyMs: body.latencyMs,
-        inputTokens: body.inputTokens,
-        outputTokens: body.outputTokens,
-        content: contentValue,
-        toolCalls: JSON.stringify(body.toolCalls),
-        metadata: JSON.stringify(body.metadata),
-      },
-    });
+    const turn = await prisma.sessionTurn.create({ data: turnData(sessionId, body) });
 
     // Notify any SSE listeners
     notifyTurnAdded(sessionId, turn);
@@ -216,6 +237,89 @@ sessionsRouter.post('/:id/turns', async (req: AuthRequest, res, next) => {
   } catch (err) { next(err); }
 });
 
+const turnsBatchSchema = z.object({
+  turns: z.array(turnSchema).max(100),
+  end: z.object({ status: z.string().default('COMPLETED') }).optional(),
+});
+
+// Append several turns (and optionally end the session) in one round-trip.
+// Used by the SDKs to record an entire LLM call with a single request.
+sessionsRouter.post('/:id/turns/batch', async (req: AuthRequest, res, next) => {
+  try {
+    const body = turnsBatchSchema.parse(req.body);
+    const session = await prisma.session.findFirst({
+      where: { id: req.params.id, agent: { orgId: req.user!.orgId } },
+    });
+    if (!session) { res.status(404).json({ error: 'Session not found' }); return; }
+    const { id: sessionId } = req.params;
+
+    // Space createdAt by 1ms so turns keep their order when listed
+    const base = Date.now();
+    const turns = await prisma.$transaction(
+      body.turns.map((t, i) => prisma.sessionTurn.create({ data: turnData(sessionId, t, new Date(base + i)) })),
+    );
+    for (const turn of turns) notifyTurnAdded(sessionId, turn);
+
+    let updated = session;
+    if (body.end) {
+      updated = await prisma.session.update({
+        where: { id: sessionId },
+        data: { endedAt: new Date(), status: body.end.status },
+      });
+      notifyTurnAdded(sessionId, { __type: 'session.ended', sessionId });
+    }
+
+    res.status(201).json({ turns, session: updated });
+  } catch (err) { next(err); }
+});
+
+const bulkSchema = z.object({
+  session: createSchema,
+  turns: z.array(turnSchema).max(100).default([]),
+  end: z.object({ status: z.string().default('COMPLETED') }).optional(),
+});
+
+// Create a session, record its turns and optionally end it in one round-trip.
+// If session.id names an existing session the turns are appended to it
+// instead.  Used by the SDKs to record LLM calls and managed sessions.
+sessionsRouter.post('/bulk', async (req: AuthRequest, res, next) => {
+  try {
+    const body = bulkSchema.parse(req.body);
+    const agent = await prisma.agent.findFirst({ where: { id: body.session.agentId, orgId: req.user!.orgId } });
+    if (!agent) { res.status(404).json({ error: 'Agent not found' }); return; }
+
+    const existing = await findClientSession(body.session.id);
+    if (existing && existing.agent.orgId !== req.user!.orgId) { res.status(409).json({ error: 'Session id already in use' }); return; }
+
+    const base = Date.now();
+    const end = body.end && { endedAt: new Date(base + body.turns.length), status: body.end.status };
+    const result = await prisma.$transaction(async (tx) => {
+      let session = existing ?? await tx.session.create({
+        data: { ...sessionData(body.session), ...end },
+      });
+      // Space createdAt by 1ms so turns keep their order when listed
+      const turns = [];
+      for (const [i, t] of body.turns.entries()) {
+        turns.push(await tx.sessionTurn.create({ data: turnData(session.id, t, new Date(base + i)) }));
+      }
+      if (existing && end) session = await tx.session.update({ where: { id: session.id }, data: end });
+      return { ...session, turns };
+    });
+
+    // Only an existing session can already have SSE listeners.  A new one
+    // is audited like POST /, without the turns' conversation content.
+    if (existing) {
+      for (const turn of result.turns) notifyTurnAdded(result.id, turn);
+      if (end) notifyTurnAdded(result.id, { __type: 'session.ended', sessionId: result.id });
+    } else {
+      const { turns: _turns, ...created } = result;
+      recordAudit(req, 'session.create', 'Session', created.id, created);
+    }
+
+    res.status(existing ? 200 : 201).json(result);
+  } catch (err) { next(err); }
+});
+
 sessionsRouter.post('/:id/end', auditLog('session.end', 'Session'), async (req: AuthRequest, res, next) => {
   try {
     const { totalTokens, totalLatencyMs } = z.object({
@@ -1,73 +1,387 @@
 """
 Provenant AgentOps SDK for Python.
-Stdlib-only — no third-party dependencies required.
+Stdlib-only — no third-party dependencies required.  If orjson or ujson is
+installed it is used for JSON encoding/decoding automatically.
 """
 
-import asyncio
+import atexit
+import base64
+import collections
 import contextlib
+import functools
+import http.client
 import json
-import re
-import sys
+import logging
+import os
+import random
+import select
+import socket
 import threading
 import time
+import urllib.parse
 import urllib.request
-import urllib.error
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextvars import ContextVar
-from typing import Any, Dict, Iterator, List, Optional
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# JSON backend: orjson → ujson → stdlib.  _dumps returns str (for turn
+# content), _encode returns bytes (request bodies), _loads accepts bytes.
+# orjson is told to accept non-str keys, and both fast backends fall back to
+# the stdlib encoder on anything they still reject (e.g. ints wider than 64
+# bits), so they never change which inputs encode.
+#
+# One reusable compact encoder: no whitespace on the wire, and no per-call
+# JSONEncoder construction as json.dumps(..., separators=) would do.
+_std_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+try:
+    import orjson as _orjson
+
+    _ORJSON_OPTS = _orjson.OPT_NON_STR_KEYS
+
+    def _encode(obj: Any) -> bytes:
+        try:
+            return _orjson.dumps(obj, option=_ORJSON_OPTS)
+        except TypeError:
+            return _std_dumps(obj).encode()
+
+    def _dumps(obj: Any) -> str:
+        try:
+            return _orjson.dumps(obj, option=_ORJSON_OPTS).decode()
+        except TypeError:
+            return _std_dumps(obj)
+
+    _loads = _orjson.loads
+except ImportError:
+    try:
+        import ujson as _ujson
+
+        def _dumps(obj: Any) -> str:
+            try:
+                return _ujson.dumps(obj)
+            except (TypeError, OverflowError):
+                return _std_dumps(obj)
+
+        def _encode(obj: Any) -> bytes:
+            return _dumps(obj).encode()
+
+        _loads = _ujson.loads
+    except ImportError:
+        _dumps = _std_dumps
+
+        def _encode(obj: Any) -> bytes:
+            return _dumps(obj).encode()
+
+        _loads = json.loads
 
+_HEX_DIGITS = b"0123456789abcdefABCDEF"
 
-# Matches a standard UUID v4 string
-_UUID_RE = re.compile(
-    r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',
-    re.IGNORECASE,
+
+def _is_uuid(s: str) -> bool:
+    """
+    Return True if ``s`` is a canonical 36-character UUID string
+    (8-4-4-4-12 hex digits).  Plain byte checks, no regex.
+    """
+    if len(s) != 36 or not s.isascii():
+        return False
+    b = s.encode()
+    # Hyphens at the four fixed positions, and nothing but hex elsewhere
+    return b[8] == b[13] == b[18] == b[23] == 45 and b.translate(None, _HEX_DIGITS) == b"----"
+
+
+_log = logging.getLogger("provenant")
+# Library convention: emit records, leave handler/level setup to the app
+_log.addHandler(logging.NullHandler())
+
+# A failing backend would otherwise log the same warning on every call from
+# every thread — each message template is emitted at most once per interval.
+_WARN_INTERVAL = 60.0
+_warned_at: Dict[str, float] = {}
+
+
+def _warn(template: str, *args: Any) -> None:
+    """Rate-limited ``_log.warning`` with lazy %-formatting."""
+    if not _log.isEnabledFor(logging.WARNING):
+        return
+    now = time.monotonic()
+    last = _warned_at.get(template)
+    if last is not None and now - last < _WARN_INTERVAL:
+        return
+    _warned_at[template] = now
+    _log.warning(template, *args)
+
+
+# Uploader for the turns recorded by instrumented calls inside a
+# `with prov.session(...)` block.  A ContextVar, so each thread and asyncio
+# task sees only the session it entered.
+_session_uploader: ContextVar[Optional["_TurnUploader"]] = ContextVar(
+    '_provenant_uploader', default=None
 )
 
-# Module-level ContextVar — holds the active session ID when inside a
-# `with prov.session(...)` block.  ContextVar is safe across threads
-# (Python copies the calling context into daemon threads automatically).
-_active_session: ContextVar[Optional[str]] = ContextVar('_provenant_session', default=None)
+# Server-side limit on turns per batch/bulk request
+_MAX_BATCH_TURNS = 100
+
+
+def _split_turns(turns: List[Dict]) -> List[List[Dict]]:
+    """Split ``turns`` into request-sized chunks (one empty chunk if none)."""
+    if len(turns) <= _MAX_BATCH_TURNS:
+        return [turns]
+    return [turns[i:i + _MAX_BATCH_TURNS] for i in range(0, len(turns), _MAX_BATCH_TURNS)]
+
+# A managed session uploads once this many turns are pending, or when a turn
+# arrives this many seconds after the previous upload
+_UPLOAD_BATCH = 32
+_UPLOAD_INTERVAL = 2.0
+
+# Shared worker pool for background recording.  Bursts of instrumented calls
+# reuse a bounded set of threads instead of spawning one thread per call.
+_bg_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("PROVENANT_BG_WORKERS", "8")),
+    thread_name_prefix="provenant",
+)
+atexit.register(_bg_pool.shutdown)
+
+
+def _record_safely(record_call: Any, turns: List[Dict], end_status: Optional[str]) -> None:
+    try:
+        record_call(turns, end_status=end_status)
+    except Exception as exc:
+        _warn("record warning: %s", exc)
+
+
+def _record_in_background(record_call: Any, turns: List[Dict], end_status: Optional[str]) -> None:
+    """Queue ``record_call(turns, end_status=...)`` on the background pool."""
+    _bg_pool.submit(_record_safely, record_call, turns, end_status)
+
+
+def _submit_turns(
+    record_call: Any, uploader: Optional["_TurnUploader"], turns: List[Dict], end_status: str
+) -> None:
+    """Hand ``turns`` to the managed session's uploader, or record them as
+    their own session (ended with ``end_status``) in the background."""
+    if uploader is not None:
+        uploader.submit(turns)
+    else:
+        _record_in_background(record_call, turns, end_status)
+
+
+# Responses worth retrying: rate limiting and gateway/availability errors.
+# A 502/504 may come back after the upstream already applied the write, so
+# non-idempotent requests only retry responses that mean "not processed".
+_RETRY_STATUSES = frozenset((429, 502, 503, 504))
+_RETRY_UNPROCESSED = frozenset((429, 503))
+_IDEMPOTENT_METHODS = frozenset(("GET", "DELETE"))
+_MAX_ATTEMPTS = 3
+_MAX_RETRY_AFTER = 10.0
+# Idle keep-alive connections kept per client
+_POOL_MAXSIZE = 16
+# Idle connections older than this are closed rather than reused — below
+# common server keep-alive timeouts (Node's default is 5s), so a request is
+# never written just as the server closes the socket
+_POOL_IDLE_TIMEOUT = 4.0
+
+
+def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retry ``attempt + 1``: honours a numeric
+    Retry-After header, otherwise exponential backoff with jitter."""
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), _MAX_RETRY_AFTER)
+        except ValueError:
+            pass
+    return 0.05 * (2 ** attempt) + random.uniform(0, 0.05)
+
+
+def _sock_dropped(sock: socket.socket) -> bool:
+    """True if an idle keep-alive socket is readable — the server closed it
+    (or sent something unsolicited), so it must not carry another request."""
+    try:
+        if hasattr(select, "poll"):
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            return bool(poller.poll(0))
+        return bool(select.select([sock], [], [], 0)[0])
+    except (OSError, ValueError):
+        return True
 
 
 class ProvenantError(Exception):
+    __slots__ = ("status_code",)
+
     def __init__(self, status_code: int, message: str):
         super().__init__(f"HTTP {status_code}: {message}")
         self.status_code = status_code
 
 
 class _HttpClient:
+    """
+    Minimal JSON-over-HTTP transport.  Keep-alive connections to the API
+    host are pooled and shared by all threads, so requests — including ones
+    from short-lived threads — reuse an open connection and skip the
+    TCP + TLS handshake.
+
+    ``HTTP(S)_PROXY`` / ``NO_PROXY`` are honoured as urllib would: HTTPS
+    goes through a CONNECT tunnel, plain HTTP sends absolute-URI requests
+    to the proxy.  Redirects are not followed.
+    """
+
+    __slots__ = (
+        "base_url",
+        "api_key",
+        "timeout",
+        "_conn_cls",
+        "_conn_host",
+        "_tunnel",
+        "_url_prefix",
+        "_idle",
+        "_headers",
+    )
+
     def __init__(self, base_url: str, api_key: str, timeout: int = 30):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
         self.timeout = timeout
-
-    def _request(self, method: str, path: str, body: Optional[Dict] = None) -> Any:
-        url = f"{self.base_url}/api{path}"
-        data = json.dumps(body).encode() if body is not None else None
-        req = urllib.request.Request(
-            url,
-            data=data,
-            method=method,
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}",
-            },
+        parts = urllib.parse.urlsplit(self.base_url)
+        https = parts.scheme == "https"
+        self._conn_cls = http.client.HTTPSConnection if https else http.client.HTTPConnection
+        self._conn_host = parts.netloc
+        self._tunnel: Optional[Tuple[str, Dict[str, str]]] = None
+        self._url_prefix = parts.path
+        # Idle connections, most recently used last (deque ops are atomic)
+        self._idle: "collections.deque[Tuple[http.client.HTTPConnection, float]]" = (
+            collections.deque()
         )
-        try:
-            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                return json.loads(resp.read().decode())
-        except urllib.error.HTTPError as e:
+        self._headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        }
+
+        # Proxies are resolved once, not per request
+        proxy = urllib.request.getproxies().get(parts.scheme)
+        if proxy and not urllib.request.proxy_bypass(parts.netloc):
+            if "://" not in proxy:
+                proxy = "http://" + proxy
+            pparts = urllib.parse.urlsplit(proxy)
+            proxy_headers: Dict[str, str] = {}
+            if pparts.username:
+                userpass = ":".join(
+                    urllib.parse.unquote(v) for v in (pparts.username, pparts.password or "")
+                )
+                proxy_headers["Proxy-Authorization"] = (
+                    "Basic " + base64.b64encode(userpass.encode()).decode()
+                )
+            self._conn_host = pparts.netloc.rpartition("@")[2]
+            if https:
+                self._tunnel = (parts.netloc, proxy_headers)
+            else:
+                self._url_prefix = f"http://{parts.netloc}{parts.path}"
+                self._headers.update(proxy_headers)
+
+    def _checkout(self) -> http.client.HTTPConnection:
+        while True:
+            try:
+                conn, idle_since = self._idle.pop()
+            except IndexError:
+                break
+            # Drop sockets that idled too long or that the server already
+            # closed, before sending on them — a request that may have been
+            # processed cannot be resent
+            if conn.sock is None or (
+                time.monotonic() - idle_since < _POOL_IDLE_TIMEOUT
+                and not _sock_dropped(conn.sock)
+            ):
+                return conn
+            conn.close()
+        conn = self._conn_cls(self._conn_host, timeout=self.timeout)
+        if self._tunnel is not None:
+            conn.set_tunnel(self._tunnel[0], headers=self._tunnel[1])
+        return conn
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        if len(self._idle) < _POOL_MAXSIZE:
+            self._idle.append((conn, time.monotonic()))
+        else:
+            conn.close()
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[bytes],
+        headers: Dict[str, str],
+        replayable: bool,
+    ) -> Any:
+        conn = self._checkout()
+        reused = conn.sock is not None
+        for attempt in range(2):
+            sent = False
             try:
-                payload = json.loads(e.read().decode())
-                msg = payload.get("error", e.reason)
+                conn.request(method, url, body=data, headers=headers)
+                sent = True
+                resp = conn.getresponse()
+                raw = resp.read()
+            except ConnectionError:
+                conn.close()
+                # A reused socket may have been closed by the server while
+                # idle — retry once on a fresh connection, unless the request
+                # went out and may already have been processed.
+                if attempt or not reused or (sent and not replayable):
+                    raise
             except Exception:
-                msg = e.reason
-            raise ProvenantError(e.code, msg)
+                conn.close()
+                raise
+            self._checkin(conn)
+            return resp, raw
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[Dict] = None,
+        idempotent: Optional[bool] = None,
+    ) -> Any:
+        """
+        Send one API request.  Idempotent requests (GET/DELETE, or callers
+        passing ``idempotent=True``) are retried on any retryable status or
+        connection error; others only when the server cannot have processed
+        them — 429/503 or a refused connection, never a timeout.
+        """
+        url = f"{self._url_prefix}/api{path}"
+        data = _encode(body) if body is not None else None
+        if idempotent is None:
+            idempotent = method in _IDEMPOTENT_METHODS
+        retry_statuses = _RETRY_STATUSES if idempotent else _RETRY_UNPROCESSED
+        last = _MAX_ATTEMPTS - 1
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                resp, raw = self._send(method, url, data, self._headers, idempotent)
+            except (ConnectionError, socket.timeout) as e:
+                if attempt == last or not (idempotent or isinstance(e, ConnectionRefusedError)):
+                    raise
+                time.sleep(_backoff(attempt))
+                continue
+            if resp.status in retry_statuses and attempt < last:
+                time.sleep(_backoff(attempt, resp.getheader("Retry-After")))
+                continue
+            break
+        if resp.status >= 400:
+            try:
+                payload = _loads(raw)
+                msg = payload.get("error", resp.reason)
+            except Exception:
+                msg = resp.reason
+            raise ProvenantError(resp.status, msg)
+        return _loads(raw)
 
     def get(self, path: str) -> Any:
         return self._request("GET", path)
 
-    def post(self, path: str, body: Dict) -> Any:
-        return self._request("POST", path, body)
+    def post(self, path: str, body: Dict, idempotent: bool = False) -> Any:
+        return self._request("POST", path, body, idempotent)
 
     def patch(self, path: str, body: Dict) -> Any:
         return self._request("PATCH", path, body)
@@ -76,6 +390,78 @@ class _HttpClient:
         return self._request("DELETE", path)
 
 
+class _TurnUploader:
+    """
+    Uploads a managed session's turns in the background while the session
+    is open.  Turns accumulate until ``_UPLOAD_BATCH`` are pending, or until
+    turns arrive ``_UPLOAD_INTERVAL`` or more after the last upload (there is
+    no timer), and are then sent as one batch, so instrumented calls never
+    wait on an upload.  The
+    session create and its batches go on a per-session queue drained by at
+    most one pool task, so they reach the API in order without workers
+    blocking on each other.
+    """
+
+    __slots__ = ("_client", "_body", "_pending", "_lock", "_jobs", "_draining", "_uploaded_at")
+
+    def __init__(self, client: "ProvenantClient", body: Dict[str, Any]) -> None:
+        self._client = client
+        self._body = body
+        self._pending: List[Dict] = []
+        self._lock = threading.Lock()
+        self._jobs: "collections.deque[Callable[[], Any]]" = collections.deque()
+        self._draining = False
+        self._uploaded_at = time.monotonic()
+        with self._lock:
+            self._enqueue(functools.partial(client._create_quietly, body))
+
+    def submit(self, turns: List[Dict]) -> None:
+        if not turns:
+            return
+        with self._lock:
+            self._pending.extend(turns)
+            if (
+                len(self._pending) < _UPLOAD_BATCH
+                and time.monotonic() - self._uploaded_at < _UPLOAD_INTERVAL
+            ):
+                return
+            self._schedule(None)
+
+    def close(self, end_status: str) -> None:
+        """Upload whatever is pending and end the session."""
+        with self._lock:
+            self._schedule(end_status)
+
+    def _schedule(self, end_status: Optional[str]) -> None:
+        # Called with the lock held
+        batch, self._pending = self._pending, []
+        self._uploaded_at = time.monotonic()
+        self._enqueue(functools.partial(self._upload, batch, end_status))
+
+    def _enqueue(self, job: Callable[[], Any]) -> None:
+        # Called with the lock held; starts a drain task unless one is running
+        self._jobs.append(job)
+        if not self._draining:
+            self._draining = True
+            _bg_pool.submit(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                if not self._jobs:
+                    self._draining = False
+                    return
+                job = self._jobs.popleft()
+            job()
+
+    def _upload(self, turns: List[Dict], end_status: Optional[str]) -> None:
+        try:
+            # A bulk upsert, so the turns still land if the create failed
+            self._client.bulk_record(self._body, turns, end_status=end_status)
+        except Exception as e:
+            _warn("session upload warning: %s", e)
+
+
 class ProvenantClient:
     """
     Client for the Provenant AgentOps API.
@@ -98,6 +484,8 @@ class ProvenantClient:
         # Session is automatically ended when the block exits.
     """
 
+    __slots__ = ("_http",)
+
     def __init__(self, base_url: str, api_key: str, timeout: int = 30):
         self._http = _HttpClient(base_url, api_key, timeout)
 
@@ -114,7 +502,7 @@ class ProvenantClient:
         Return the ID of an existing agent with the given name, creating it
         if it doesn't exist yet. Idempotent — safe to call on every startup.
         """
-        result = self._http.post("/agents/get-or-create", {"name": name})
+        result = self._http.post("/agents/get-or-create", {"name": name}, idempotent=True)
         return result["id"]
 
     # ── Sessions ─────────────────────────────────────────────────────────────
@@ -130,7 +518,7 @@ class ProvenantClient:
         external_id: Optional[str] = None,
         metadata: Optional[Dict] = None,
         tags: Optional[List[str]] = None,
-    ) -> Iterator[Optional[str]]:
+    ) -> Iterator[str]:
         """
         Context manager that groups all instrumented LLM calls inside the
         block into a single Provenant session with multiple turns.
@@ -140,31 +528,32 @@ class ProvenantClient:
             with prov.session(agent_id, user_id="u1", external_id="conv-abc") as sid:
                 r1 = client.messages.create(...)   # turn 1 → same session
                 r2 = client.messages.create(...)   # turn 2 → same session
-            # Session auto-ended on exit
+            # Turns are sent and the session ended on exit
+
+        The session ID is generated client-side, so entering the block does
+        not wait on the API: the session is created in the background, and
+        turns are uploaded in batches in the background while the block runs.
+        The last batch, sent on exit, ends the session.
         """
+        body = _session_body(
+            agent_id, agent_version_id, environment_id, external_id, user_id, metadata, tags
+        )
+        sid = body["id"] = str(uuid.uuid4())
+        uploader = _TurnUploader(self, body)
+        token = _session_uploader.set(uploader)
         try:
-            s = self.create_session(
-                agent_id=agent_id,
-                user_id=user_id,
-                agent_version_id=agent_version_id,
-                environment_id=environment_id,
-                external_id=external_id,
-                metadata=metadata,
-                tags=tags,
-            )
-        except Exception as e:
-            print(f"[provenant] session create warning: {e}", file=sys.stderr)
-            yield None
-            return
-        token = _active_session.set(s["id"])
-        try:
-            yield s["id"]
+            yield sid
         finally:
-            _active_session.reset(token)
-            try:
-                self.end_session(s["id"])
-            except Exception as e:
-                print(f"[provenant] session end warning: {e}", file=sys.stderr)
+            _session_uploader.reset(token)
+            uploader.close("COMPLETED")
+
+    def _create_quietly(self, body: Dict[str, Any]) -> bool:
+        try:
+            self._post_session(body)
+            return True
+        except Exception as e:
+            _warn("session create warning: %s", e)
+            return False
 
     def create_session(
         self,
@@ -175,21 +564,50 @@ class ProvenantClient:
         user_id: Optional[str] = None,
         metadata: Optional[Dict] = None,
         tags: Optional[List[str]] = None,
+        session_id: Optional[str] = None,
+    ) -> Dict:
+        """
+        Create a session.  Pass ``session_id`` (a UUID) to choose the ID
+        client-side; creating the same ID again returns the existing session.
+        """
+        body = _session_body(
+            agent_id, agent_version_id, environment_id, external_id, user_id, metadata, tags
+        )
+        if session_id:
+            body["id"] = session_id
+        return self._post_session(body)
+
+    def _post_session(self, body: Dict[str, Any]) -> Dict:
+        """Create a session from a prebuilt ``_session_body`` payload."""
+        # With a client-chosen id, creating again returns the same session
+        return self._http.post("/sessions", body, idempotent="id" in body)
+
+    def bulk_record(
+        self,
+        session: Dict[str, Any],
+        turns: List[Dict],
+        end_status: Optional[str] = None,
     ) -> Dict:
-        body: Dict[str, Any] = {"agentId": agent_id}
-        if agent_version_id:
-            body["agentVersionId"] = agent_version_id
-        if environment_id:
-            body["environmentId"] = environment_id
-        if external_id:
-            body["externalId"] = external_id
-        if user_id:
-            body["userId"] = user_id
-        if metadata:
-            body["metadata"] = metadata
-        if tags:
-            body["tags"] = tags
-        return self._http.post("/sessions", body)
+        """
+        Create a session and record its turns in a single request.
+        ``session`` is an API-shaped session payload (``agentId``, ...) and
+        each turn an API-shaped turn dict.  If the payload carries an ``id``
+        that already exists, the turns are added to that session instead.
+        If ``end_status`` is given, the session is ended with that status.
+        Turns beyond the server's per-request limit are appended with
+        ``add_turns`` once the session exists.
+
+        Returns the new session, with its ``turns``.
+        """
+        first, rest = turns[:_MAX_BATCH_TURNS], turns[_MAX_BATCH_TURNS:]
+        body: Dict[str, Any] = {"session": session, "turns": first}
+        if end_status and not rest:
+            body["end"] = {"status": end_status}
+        result = self._http.post("/sessions/bulk", body)
+        if rest:
+            added = self.add_turns(result["id"], rest, end_status=end_status)
+            result = {**added["session"], "turns": result["turns"] + added["turns"]}
+        return result
 
     def get_session(self, session_id: str) -> Dict:
         return self._http.get(f"/sessions/{session_id}")
@@ -205,25 +623,41 @@ class ProvenantClient:
         output_tokens: Optional[int] = None,
         metadata: Optional[Dict] = None,
     ) -> Dict:
-        body: Dict[str, Any] = {"role": role, "content": content}
-        if tool_calls is not None:
-            body["toolCalls"] = tool_calls
-        if latency_ms is not None:
-            body["latencyMs"] = latency_ms
-        if input_tokens is not None:
-            body["inputTokens"] = input_tokens
-        if output_tokens is not None:
-            body["outputTokens"] = output_tokens
-        if metadata:
-            body["metadata"] = metadata
-        return self._http.post(f"/sessions/{session_id}/turns", body)
+        turn = _turn_body(
+            role, content, tool_calls, latency_ms, input_tokens, output_tokens, metadata
+        )
+        return self.add_turns(session_id, [turn])["turns"][0]
+
+    def add_turns(
+        self,
+        session_id: str,
+        turns: List[Dict],
+        end_status: Optional[str] = None,
+    ) -> Dict:
+        """
+        Append several turns to a session in a single request.  Each turn is
+        an API-shaped dict (``role``, ``content``, ``toolCalls``, ...).  If
+        ``end_status`` is given, the session is ended with that status in the
+        same round-trip.  More turns than the server accepts per request are
+        sent in consecutive batches, the last one ending the session.
+
+        Returns ``{"turns": [...], "session": {...}}``.
+        """
+        path = f"/sessions/{session_id}/turns/batch"
+        chunks = _split_turns(turns)
+        recorded: List[Dict] = []
+        for i, chunk in enumerate(chunks, 1):
+            body: Dict[str, Any] = {"turns": chunk}
+            if end_status and i == len(chunks):
+                body["end"] = {"status": end_status}
+            result = self._http.post(path, body)
+            recorded.extend(result["turns"])
+        result["turns"] = recorded
+        return result
 
     def end_session(self, session_id: str, status: str = "COMPLETED") -> Dict:
-        import datetime
-        return self._http.patch(f"/sessions/{session_id}", {
-            "status": status,
-            "endedAt": datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S.000Z"),
-        })
+        """End a session with ``status``; the server stamps ``endedAt``."""
+        return self.add_turns(session_id, [], end_status=status)["session"]
 
     # ── Evals ────────────────────────────────────────────────────────────────
 
@@ -234,12 +668,12 @@ class ProvenantClient:
         agent_version_id: Optional[str] = None,
         environment_id: Optional[str] = None,
     ) -> Dict:
-        body: Dict[str, Any] = {"suiteId": suite_id, "agentId": agent_id}
-        if agent_version_id:
-            body["agentVersionId"] = agent_version_id
-        if environment_id:
-            body["environmentId"] = environment_id
-        return self._http.post("/evals/runs", body)
+        return self._http.post("/evals/runs", {"suiteId": suite_id, "agentId": agent_id, **{
+            k: v for k, v in (
+                ("agentVersionId", agent_version_id),
+                ("environmentId", environment_id),
+            ) if v
+        }})
 
     def get_eval_run(self, run_id: str) -> Dict:
         return self._http.get(f"/evals/runs/{run_id}")
@@ -250,20 +684,122 @@ class ProvenantClient:
     def wait_for_completion(
         self,
         run_id: str,
-        poll_interval_seconds: float = 2.0,
+        poll_interval_seconds: float = 0.5,
         timeout_seconds: float = 300.0,
+        max_interval_seconds: float = 10.0,
     ) -> Dict:
-        deadline = time.time() + timeout_seconds
-        while time.time() < deadline:
+        """
+        Poll until the run is COMPLETED or FAILED.  The interval starts at
+        ``poll_interval_seconds`` and grows 1.5x per poll up to
+        ``max_interval_seconds``, so short runs are noticed quickly and long
+        ones don't cost hundreds of requests.
+        """
+        deadline = time.monotonic() + timeout_seconds
+        interval = poll_interval_seconds
+        while time.monotonic() < deadline:
             run = self.get_eval_run(run_id)
             if run["status"] in ("COMPLETED", "FAILED"):
                 return run
-            time.sleep(poll_interval_seconds)
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            interval = min(interval * 1.5, max_interval_seconds)
         raise TimeoutError(f"Eval run {run_id} did not complete within {timeout_seconds}s")
 
 
 # ── Shared helpers ────────────────────────────────────────────────────────────
 
+def _session_body(
+    agent_id: str,
+    agent_version_id: Optional[str] = None,
+    environment_id: Optional[str] = None,
+    external_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+    metadata: Optional[Dict] = None,
+    tags: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the API payload for creating a session.  The instrumenters build
+    this once per ``instrument()`` call and reuse it for every session.
+    """
+    return {"agentId": agent_id, **{k: v for k, v in (
+        ("agentVersionId", agent_version_id),
+        ("environmentId", environment_id),
+        ("externalId", external_id),
+        ("userId", user_id),
+        ("metadata", metadata),
+        ("tags", tags),
+    ) if v}}
+
+
+def _bind_record_call(
+    provenant: "ProvenantClient", agent_id: str, session_opts: Dict
+) -> Callable[..., Dict]:
+    """
+    ``bulk_record`` with the session payload fixed at instrumentation time —
+    the payload is built once, and each call passes just its turns and end
+    status.
+    """
+    return functools.partial(provenant.bulk_record, _session_body(agent_id, **session_opts))
+
+
+def _turn_body(
+    role: str,
+    content: Any,
+    tool_calls: Optional[List] = None,
+    latency_ms: Optional[int] = None,
+    input_tokens: Optional[int] = None,
+    output_tokens: Optional[int] = None,
+    metadata: Optional[Dict] = None,
+) -> Dict[str, Any]:
+    """
+    Build the API payload for a single session turn.  This runs for every
+    recorded turn, so it stays a plain if-chain — measurably faster than a
+    filtered dict comprehension.
+    """
+    body: Dict[str, Any] = {"role": role, "content": content}
+    if tool_calls is not None:
+        body["toolCalls"] = tool_calls
+    if latency_ms is not None:
+        body["latencyMs"] = latency_ms
+    if input_tokens is not None:
+        body["inputTokens"] = input_tokens
+    if output_tokens is not None:
+        body["outputTokens"] = output_tokens
+    if metadata:
+        body["metadata"] = metadata
+    return body
+
+
+def _as_content(content: Any) -> str:
+    """Message content as a string — non-string content is JSON-encoded."""
+    if not isinstance(content, str):
+        content = _dumps(content)
+    return content
+
+
+def _user_turns(messages: List[Dict]) -> List[Dict]:
+    """The last user message as a one-item turn list (empty if there is
+    none, or if its content cannot be encoded — that is logged instead)."""
+    last_user = _last_user(messages)
+    if not last_user:
+        return []
+    try:
+        return [_turn_body("USER", _as_content(last_user.get("content", "")))]
+    except Exception as exc:
+        _warn("turn build warning: %s", exc)
+        return []
+
+
+def _last_user(messages: List[Dict]) -> Optional[Dict]:
+    """Return the most recent user message, scanning backwards by index."""
+    for i in range(len(messages) - 1, -1, -1):
+        m = messages[i]
+        if isinstance(m, dict) and m.get("role") == "user":
+            return m
+    return None
+
+
+# ── Provider extractors ───────────────────────────────────────────────────────
+
 def _extract_anthropic_tool_calls(response: Any) -> List[Dict]:
     """Extract tool_use blocks from an Anthropic response."""
     return [
@@ -279,30 +815,198 @@ def _extract_anthropic_tool_calls(response: Any) -> List[Dict]:
 
 def _extract_anthropic_text(response: Any) -> str:
     """Extract concatenated text from an Anthropic response content array."""
-    return "".join(
-        getattr(b, "text", "")
+    # One attribute fetch per block; a list joins faster than a generator
+    return "".join([
+        t
         for b in (getattr(response, "content", []) or [])
-        if hasattr(b, "text")
-    )
+        if (t := getattr(b, "text", None)) is not None
+    ])
+
+
+# Stream chunks are read once per token, so their attribute paths are
+# compiled into C-level getters up front.
+_anth_delta = attrgetter("delta")
+_oai_choices = attrgetter("choices")
+_oai_delta_content = attrgetter("delta.content")
+
 
+def _anthropic_chunk_text(chunk: Any) -> Optional[str]:
+    """Text carried by an Anthropic stream event, if it is a text delta."""
+    try:
+        d = _anth_delta(chunk)
+        if d.type == "text_delta":
+            return d.text
+    except AttributeError:
+        pass
+    return None
 
-def _detect_anthropic_tool_results(messages: List[Dict]) -> List[Dict]:
+
+def _scan_anthropic_messages(messages: List[Dict]) -> Tuple[Optional[Dict], List[Dict]]:
     """
-    Return tool_result content items found in user messages (Anthropic format).
-    Each item is: {"type": "tool_result", "tool_use_id": "...", "content": ...}
+    Single reverse pass over an Anthropic messages list.  Returns the last
+    user message and every tool_result item (in original order).
     """
-    results = []
-    for m in messages:
-        if m.get("role") == "user" and isinstance(m.get("content"), list):
-            for c in m["content"]:
+    last_user: Optional[Dict] = None
+    tool_results: List[Dict] = []
+    for i in range(len(messages) - 1, -1, -1):
+        m = messages[i]
+        if not isinstance(m, dict) or m.get("role") != "user":
+            continue
+        if last_user is None:
+            last_user = m
+        content = m.get("content")
+        if isinstance(content, list):
+            for j in range(len(content) - 1, -1, -1):
+                c = content[j]
                 if isinstance(c, dict) and c.get("type") == "tool_result":
-                    results.append(c)
-    return results
+                    tool_results.append(c)
+    tool_results.reverse()
+    return last_user, tool_results
+
+
+def _anthropic_tool_turns(tool_results: List[Dict]) -> List[Dict]:
+    """All tool_result items are recorded together as one TOOL turn."""
+    return [_turn_body("TOOL", _dumps(tool_results))] if tool_results else []
+
+
+def _openai_message(response: Any) -> Any:
+    choices = getattr(response, "choices", []) or []
+    return getattr(choices[0], "message", None) if choices else None
 
 
-def _detect_openai_tool_results(messages: List[Dict]) -> List[Dict]:
-    """Return messages with role == 'tool' (OpenAI tool result format)."""
-    return [m for m in messages if isinstance(m, dict) and m.get("role") == "tool"]
+def _extract_openai_text(response: Any) -> str:
+    """Extract the assistant text from an OpenAI chat completion."""
+    return getattr(_openai_message(response), "content", "") or ""
+
+
+def _extract_openai_tool_calls(response: Any) -> List[Dict]:
+    """Extract tool_calls from an OpenAI chat completion."""
+    raw_tc = getattr(_openai_message(response), "tool_calls", None) or []
+    calls: List[Dict] = []
+    append = calls.append
+    for tc in raw_tc:
+        # Fast path: plain attribute access, with function bound once
+        try:
+            fn = tc.function
+            append({"id": tc.id, "name": fn.name, "arguments": fn.arguments})
+        except AttributeError:
+            fn = getattr(tc, "function", None)
+            append({
+                "id": getattr(tc, "id", None),
+                "name": getattr(fn, "name", None),
+                "arguments": getattr(fn, "arguments", None),
+            })
+    return calls
+
+
+def _openai_chunk_text(chunk: Any) -> Optional[str]:
+    """Text carried by an OpenAI stream chunk, if any."""
+    try:
+        choices = _oai_choices(chunk)
+        return _oai_delta_content(choices[0]) if choices else None
+    except AttributeError:
+        return None
+
+
+def _scan_openai_messages(messages: List[Dict]) -> Tuple[Optional[Dict], List[Dict]]:
+    """
+    Single reverse pass over an OpenAI messages list.  Returns the last user
+    message and every role == "tool" message (in original order).
+    """
+    last_user: Optional[Dict] = None
+    tool_results: List[Dict] = []
+    for i in range(len(messages) - 1, -1, -1):
+        m = messages[i]
+        if not isinstance(m, dict):
+            continue
+        role = m.get("role")
+        if role == "tool":
+            tool_results.append(m)
+        elif role == "user" and last_user is None:
+            last_user = m
+    tool_results.reverse()
+    return last_user, tool_results
+
+
+def _openai_tool_turns(tool_msgs: List[Dict]) -> List[Dict]:
+    """Each role == "tool" message is recorded as its own TOOL turn."""
+    return [_turn_body("TOOL", _as_content(m.get("content", ""))) for m in tool_msgs]
+
+
+@dataclass(frozen=True)
+class _ProviderOps:
+    """
+    The provider-specific parts of instrumentation.  Everything else — session
+    lifecycle, batching, background recording — is shared by the wrappers
+    that ``_make_instrumenter`` / ``_make_async_instrumenter`` build.
+    """
+
+    scan_messages: Callable[[List[Dict]], Tuple[Optional[Dict], List[Dict]]]
+    tool_turns: Callable[[List[Dict]], List[Dict]]
+    extract_text: Callable[[Any], str]
+    extract_tool_calls: Callable[[Any], List[Dict]]
+    chunk_text: Callable[[Any], Optional[str]]
+    input_tokens_attr: str
+    output_tokens_attr: str
+
+    def prompt_turns(self, messages: List[Dict]) -> List[Dict]:
+        """TOOL and USER turns for the request side of an LLM call.  Runs on
+        the caller's thread, so it never raises: content that cannot be
+        encoded is logged and left out."""
+        try:
+            last_user, tool_results = self.scan_messages(messages)
+            turns = self.tool_turns(tool_results)
+            if last_user:
+                turns.append(_turn_body("USER", _as_content(last_user.get("content", ""))))
+            return turns
+        except Exception as exc:
+            _warn("turn build warning: %s", exc)
+            return []
+
+    def reply_turn(self, response: Any, latency_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """The ASSISTANT turn for an LLM response, or None if it carries no
+        text, tool calls or token usage — an empty but billed reply is still
+        recorded for cost accounting.  Like ``prompt_turns``, never raises."""
+        try:
+            text = self.extract_text(response)
+            tool_calls = self.extract_tool_calls(response)
+            usage = getattr(response, "usage", None)
+            input_tokens = getattr(usage, self.input_tokens_attr, None)
+            output_tokens = getattr(usage, self.output_tokens_attr, None)
+            if not text and not tool_calls and input_tokens is None and output_tokens is None:
+                return None
+            return _turn_body(
+                "ASSISTANT",
+                text,
+                tool_calls=tool_calls or None,
+                latency_ms=latency_ms,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+            )
+        except Exception as exc:
+            _warn("turn build warning: %s", exc)
+            return None
+
+
+_ANTHROPIC_OPS = _ProviderOps(
+    scan_messages=_scan_anthropic_messages,
+    tool_turns=_anthropic_tool_turns,
+    extract_text=_extract_anthropic_text,
+    extract_tool_calls=_extract_anthropic_tool_calls,
+    chunk_text=_anthropic_chunk_text,
+    input_tokens_attr="input_tokens",
+    output_tokens_attr="output_tokens",
+)
+
+_OPENAI_OPS = _ProviderOps(
+    scan_messages=_scan_openai_messages,
+    tool_turns=_openai_tool_turns,
+    extract_text=_extract_openai_text,
+    extract_tool_calls=_extract_openai_tool_calls,
+    chunk_text=_openai_chunk_text,
+    input_tokens_attr="prompt_tokens",
+    output_tokens_attr="completion_tokens",
+)
 
 
 # ── Anthropic streaming wrapper ───────────────────────────────────────────────
@@ -313,92 +1017,37 @@ class _AnthropicStreamWrapper:
     message as a Provenant session turn after the stream completes.
     """
 
+    # One wrapper is created per stream() call
+    __slots__ = ("_ctx_mgr", "_record_call", "_messages", "_uploader", "_stream")
+
     def __init__(
         self,
         ctx_mgr: Any,
-        provenant: "ProvenantClient",
-        agent_id: str,
+        record_call: Callable[..., Dict],
         messages: List[Dict],
-        session_opts: Dict,
-        is_managed: bool,
-        existing_sid: Optional[str],
+        uploader: Optional[_TurnUploader],
     ) -> None:
         self._ctx_mgr = ctx_mgr
-        self._provenant = provenant
-        self._agent_id = agent_id
+        self._record_call = record_call
         self._messages = messages
-        self._session_opts = session_opts
-        self._is_managed = is_managed
-        self._existing_sid = existing_sid
+        # The managed session's uploader, or None outside prov.session()
+        self._uploader = uploader
         self._stream: Any = None
-        self._session_id: Optional[str] = existing_sid
-        self._session_ok: bool = is_managed
-        self._t: Optional[threading.Thread] = None
-        self._session_id_box: List[Optional[str]] = [existing_sid]
-        self._ok_box: List[bool] = [is_managed]
 
     def __enter__(self) -> "_AnthropicStreamWrapper":
         self._stream = self._ctx_mgr.__enter__()
-        if not self._is_managed:
-            def _create() -> None:
-                try:
-                    s = self._provenant.create_session(
-                        agent_id=self._agent_id, **self._session_opts
-                    )
-                    self._session_id_box[0] = s["id"]
-                    last_user = next(
-                        (m for m in reversed(self._messages) if m.get("role") == "user"), None
-                    )
-                    if last_user:
-                        content = last_user.get("content", "")
-                        if not isinstance(content, str):
-                            content = json.dumps(content)
-                        self._provenant.add_turn(
-                            self._session_id_box[0], role="USER", content=content
-                        )
-                    self._ok_box[0] = True
-                except Exception as exc:
-                    print(f"[provenant] stream session create warning: {exc}", file=sys.stderr)
-
-            self._t = threading.Thread(target=_create, daemon=True)
-            self._t.start()
         return self
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> Any:
-        if self._t is not None:
-            self._t.join(timeout=5)
-        self._session_id = self._session_id_box[0]
-        self._session_ok = self._ok_box[0]
-
-        sid = self._session_id
-        if sid and self._session_ok:
-            try:
-                final = self._stream.get_final_message()
-                tool_calls = _extract_anthropic_tool_calls(final)
-                text = _extract_anthropic_text(final)
-                usage = getattr(final, "usage", None)
-                input_tokens = getattr(usage, "input_tokens", None)
-                output_tokens = getattr(usage, "output_tokens", None)
-                is_managed = self._is_managed
-
-                def _record() -> None:
-                    try:
-                        self._provenant.add_turn(
-                            sid,
-                            role="ASSISTANT",
-                            content=text,
-                            tool_calls=tool_calls or None,
-                            input_tokens=input_tokens,
-                            output_tokens=output_tokens,
-                        )
-                        if not is_managed:
-                            self._provenant.end_session(sid)
-                    except Exception as exc:
-                        print(f"[provenant] stream record warning: {exc}", file=sys.stderr)
-
-                threading.Thread(target=_record, daemon=True).start()
-            except Exception as exc:
-                print(f"[provenant] stream final_message warning: {exc}", file=sys.stderr)
+        try:
+            final = self._stream.get_final_message()
+            turns = _user_turns(self._messages) if self._uploader is None else []
+            reply = _ANTHROPIC_OPS.reply_turn(final)
+            if reply is not None:
+                turns.append(reply)
+            _submit_turns(self._record_call, self._uploader, turns, "COMPLETED")
+        except Exception as exc:
+            _warn("stream final_message warning: %s", exc)
 
         return self._ctx_mgr.__exit__(exc_type, exc_val, exc_tb)
 
@@ -409,152 +1058,154 @@ class _AnthropicStreamWrapper:
         return iter(self._stream)
 
 
-# ── Anthropic sync instrumentation ───────────────────────────────────────────
-
-def _instrument_anthropic(
-    client: Any,
-    provenant: ProvenantClient,
-    agent_id: str,
-    session_opts: Dict,
-) -> Any:
-    """
-    Monkey-patch client.messages.create (and .stream) to automatically record
-    sessions. Returns the original client (modified in-place).
-    """
-    original_create = client.messages.create
+# ── Instrumented create() factories ──────────────────────────────────────────
+#
+# Outside a managed session every LLM call is recorded with one bulk request
+# (session + turns + end) once the call returns.  Inside prov.session() the
+# turns go to the session's _TurnUploader instead.
+
+def _make_instrumenter(
+    original_create: Callable[..., Any],
+    record_call: Callable[..., Dict],
+    ops: _ProviderOps,
+) -> Callable[..., Any]:
+    """Build the sync ``create`` wrapper for one provider."""
+    # Bound once here so each call reads closure cells, not module globals
+    # and attribute chains.
+    current_uploader = _session_uploader.get
+    perf_ns = time.perf_counter_ns
+    submit = _submit_turns
+    prompt_turns = ops.prompt_turns
+    reply_turn = ops.reply_turn
 
     def instrumented_create(*args: Any, **kwargs: Any) -> Any:
-        existing_sid = _active_session.get()
-        is_managed = existing_sid is not None
+        uploader = current_uploader()
         messages = kwargs.get("messages", [])
 
         # ── Streaming via stream=True kwarg ──────────────────────────────
         if kwargs.get("stream"):
             response_iter = original_create(*args, **kwargs)
-            chunks: List[Any] = list(response_iter)
-            text = "".join(
-                getattr(getattr(c, "delta", None), "text", "") or ""
-                for c in chunks
-                if getattr(getattr(c, "delta", None), "type", None) == "text_delta"
-            )
-            if not is_managed:
-                def _create_and_record() -> None:
-                    try:
-                        s = provenant.create_session(agent_id=agent_id, **session_opts)
-                        sid = s["id"]
-                        last_user = next(
-                            (m for m in reversed(messages) if m.get("role") == "user"), None
-                        )
-                        if last_user:
-                            content = last_user.get("content", "")
-                            if not isinstance(content, str):
-                                content = json.dumps(content)
-                            provenant.add_turn(sid, role="USER", content=content)
-                        provenant.add_turn(sid, role="ASSISTANT", content=text)
-                        provenant.end_session(sid)
-                    except Exception as exc:
-                        print(f"[provenant] stream warning: {exc}", file=sys.stderr)
-                threading.Thread(target=_create_and_record, daemon=True).start()
-            else:
-                def _record_stream_managed() -> None:
-                    try:
-                        provenant.add_turn(existing_sid, role="ASSISTANT", content=text)
-                    except Exception as exc:
-                        print(f"[provenant] stream managed warning: {exc}", file=sys.stderr)
-                threading.Thread(target=_record_stream_managed, daemon=True).start()
-            return iter(chunks)
 
-        # ── Normal (non-streaming) create ─────────────────────────────────
-        last_user = next(
-            (m for m in reversed(messages) if isinstance(m, dict) and m.get("role") == "user"),
-            None,
-        )
-        tool_results = _detect_anthropic_tool_results(messages)
+            def _record_stream(text: str, end_status: str) -> None:
+                # Runs in the generator's finally — must not raise into the
+                # caller's loop
+                try:
+                    turns = _user_turns(messages) if uploader is None else []
+                    if text:
+                        turns.append(_turn_body("ASSISTANT", text))
+                    _submit_turns(record_call, uploader, turns, end_status)
+                except Exception as exc:
+                    _warn("record warning: %s", exc)
+
+            def _passthrough() -> Iterator[Any]:
+                # Chunks reach the caller as they arrive; only the text is
+                # kept, and recording starts once the stream is done.
+                # Exhaustion, or the caller closing the generator early
+                # (GeneratorExit), counts as completed; a provider error
+                # mid-stream as failed.
+                parts: List[str] = []
+                append = parts.append
+                chunk_text = ops.chunk_text
+                end_status = "COMPLETED"
+                try:
+                    for chunk in response_iter:
+                        text = chunk_text(chunk)
+                        if text:
+                            append(text)
+                        yield chunk
+                except Exception:
+                    end_status = "FAILED"
+                    raise
+                finally:
+                    _record_stream("".join(parts), end_status)
 
-        session_id: List[Optional[str]] = [existing_sid]
-        session_ok: List[bool] = [is_managed]
+            return _passthrough()
 
-        def _create_session() -> None:
-            try:
-                if not is_managed:
-                    s = provenant.create_session(agent_id=agent_id, **session_opts)
-                    session_id[0] = s["id"]
-                sid = session_id[0]
-                if sid is None:
-                    return
-                if tool_results:
-                    provenant.add_turn(sid, role="TOOL", content=json.dumps(tool_results))
-                if last_user:
-                    content = last_user.get("content", "")
-                    if not isinstance(content, str):
-                        content = json.dumps(content)
-                    provenant.add_turn(sid, role="USER", content=content)
-                session_ok[0] = True
-            except Exception as exc:
-                print(f"[provenant] session create warning: {exc}", file=sys.stderr)
-
-        t = threading.Thread(target=_create_session, daemon=True)
-        t.start()
-
-        t0 = time.time()
+        # ── Normal (non-streaming) create ─────────────────────────────────
+        pending = prompt_turns(messages)
+
+        t0 = perf_ns()
         try:
             response = original_create(*args, **kwargs)
         except Exception:
-            t.join(timeout=2)
-            if session_id[0] and not is_managed:
-                try:
-                    provenant.end_session(session_id[0], status="FAILED")
-                except Exception:
-                    pass
+            submit(record_call, uploader, pending, "FAILED")
             raise
 
-        latency_ms = int((time.time() - t0) * 1000)
-        t.join(timeout=5)
+        latency_ms = (perf_ns() - t0) // 1_000_000
+        reply = reply_turn(response, latency_ms)
+        if reply is not None:
+            pending.append(reply)
+        submit(record_call, uploader, pending, "COMPLETED")
+        return response
 
-        usage = getattr(response, "usage", None)
-        input_tokens: Optional[int] = getattr(usage, "input_tokens", None)
-        output_tokens: Optional[int] = getattr(usage, "output_tokens", None)
-        tool_calls = _extract_anthropic_tool_calls(response)
-        assistant_text = _extract_anthropic_text(response)
+    return instrumented_create
 
-        def _record_and_end() -> None:
-            if not session_ok[0] or not session_id[0]:
-                return
-            try:
-                provenant.add_turn(
-                    session_id[0],
-                    role="ASSISTANT",
-                    content=assistant_text,
-                    tool_calls=tool_calls or None,
-                    latency_ms=latency_ms,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                )
-                if not is_managed:
-                    provenant.end_session(session_id[0])
-            except Exception as exc:
-                print(f"[provenant] turn/end warning: {exc}", file=sys.stderr)
 
-        threading.Thread(target=_record_and_end, daemon=True).start()
+def _make_async_instrumenter(
+    original_create: Callable[..., Any],
+    record_call: Callable[..., Dict],
+    ops: _ProviderOps,
+) -> Callable[..., Any]:
+    """
+    Build the ``async def create`` wrapper for one provider.  Recording is
+    handed straight to the background pool: the event loop never schedules a
+    task or an executor hop for it.
+    """
+    current_uploader = _session_uploader.get
+    perf_ns = time.perf_counter_ns
+    submit = _submit_turns
+    prompt_turns = ops.prompt_turns
+    reply_turn = ops.reply_turn
+
+    async def instrumented_create(*args: Any, **kwargs: Any) -> Any:
+        uploader = current_uploader()
+        pending = prompt_turns(kwargs.get("messages", []))
+
+        t0 = perf_ns()
+        try:
+            response = await original_create(*args, **kwargs)
+        except Exception:
+            submit(record_call, uploader, pending, "FAILED")
+            raise
+
+        latency_ms = (perf_ns() - t0) // 1_000_000
+        reply = reply_turn(response, latency_ms)
+        if reply is not None:
+            pending.append(reply)
+        submit(record_call, uploader, pending, "COMPLETED")
         return response
 
-    client.messages.create = instrumented_create
+    return instrumented_create
+
+
+# ── Anthropic instrumentation ────────────────────────────────────────────────
+
+def _instrument_anthropic(
+    client: Any,
+    provenant: ProvenantClient,
+    agent_id: str,
+    session_opts: Dict,
+) -> Any:
+    """
+    Monkey-patch client.messages.create (and .stream) to automatically record
+    sessions. Returns the original client (modified in-place).
+    """
+    record_call = _bind_record_call(provenant, agent_id, session_opts)
+    client.messages.create = _make_instrumenter(
+        client.messages.create, record_call, _ANTHROPIC_OPS
+    )
 
     # Also patch client.messages.stream (context manager style)
     if hasattr(client, "messages") and hasattr(client.messages, "stream"):
         original_stream = client.messages.stream
 
         def patched_stream(*args: Any, **kwargs: Any) -> _AnthropicStreamWrapper:
-            existing_sid = _active_session.get()
             msgs = kwargs.get("messages", list(args[1]) if len(args) > 1 else [])
             return _AnthropicStreamWrapper(
                 ctx_mgr=original_stream(*args, **kwargs),
-                provenant=provenant,
-                agent_id=agent_id,
+                record_call=record_call,
                 messages=msgs,
-                session_opts=session_opts,
-                is_managed=existing_sid is not None,
-                existing_sid=existing_sid,
+                uploader=_session_uploader.get(),
             )
 
         client.messages.stream = patched_stream
@@ -562,249 +1213,41 @@ def _instrument_anthropic(
     return client
 
 
-# ── OpenAI sync instrumentation ──────────────────────────────────────────────
-
-def _instrument_openai(
+def _instrument_anthropic_async(
     client: Any,
     provenant: ProvenantClient,
     agent_id: str,
     session_opts: Dict,
 ) -> Any:
-    """
-    Monkey-patch client.chat.completions.create to automatically record
-    sessions. Returns the original client (modified in-place).
-    """
-    original_create = client.chat.completions.create
-
-    def instrumented_create(*args: Any, **kwargs: Any) -> Any:
-        existing_sid = _active_session.get()
-        is_managed = existing_sid is not None
-        messages = kwargs.get("messages", [])
-
-        # ── Streaming via stream=True kwarg ──────────────────────────────
-        if kwargs.get("stream"):
-            response_iter = original_create(*args, **kwargs)
-            chunks: List[Any] = list(response_iter)
-            text_parts = []
-            for chunk in chunks:
-                choices = getattr(chunk, "choices", [])
-                delta = getattr(choices[0], "delta", None) if choices else None
-                part = getattr(delta, "content", None) if delta else None
-                if part:
-                    text_parts.append(part)
-            text = "".join(text_parts)
-
-            if not is_managed:
-                def _create_and_record() -> None:
-                    try:
-                        s = provenant.create_session(agent_id=agent_id, **session_opts)
-                        sid = s["id"]
-                        last_user = next(
-                            (m for m in reversed(messages) if m.get("role") == "user"), None
-                        )
-                        if last_user:
-                            provenant.add_turn(sid, role="USER", content=last_user.get("content", ""))
-                        provenant.add_turn(sid, role="ASSISTANT", content=text)
-                        provenant.end_session(sid)
-                    except Exception as exc:
-                        print(f"[provenant] stream warning: {exc}", file=sys.stderr)
-                threading.Thread(target=_create_and_record, daemon=True).start()
-            else:
-                def _record_managed_stream() -> None:
-                    try:
-                        provenant.add_turn(existing_sid, role="ASSISTANT", content=text)
-                    except Exception as exc:
-                        print(f"[provenant] stream managed warning: {exc}", file=sys.stderr)
-                threading.Thread(target=_record_managed_stream, daemon=True).start()
-            return iter(chunks)
-
-        # ── Normal (non-streaming) create ─────────────────────────────────
-        last_user = next(
-            (m for m in reversed(messages) if isinstance(m, dict) and m.get("role") == "user"),
-            None,
-        )
-        tool_result_msgs = _detect_openai_tool_results(messages)
-
-        session_id: List[Optional[str]] = [existing_sid]
-        session_ok: List[bool] = [is_managed]
-
-        def _create_session() -> None:
-            try:
-                if not is_managed:
-                    s = provenant.create_session(agent_id=agent_id, **session_opts)
-                    session_id[0] = s["id"]
-                sid = session_id[0]
-                if sid is None:
-                    return
-                for tr in tool_result_msgs:
-                    content = tr.get("content", "")
-                    if not isinstance(content, str):
-                        content = json.dumps(content)
-                    provenant.add_turn(sid, role="TOOL", content=content)
-                if last_user:
-                    content = last_user.get("content", "")
-                    if not isinstance(content, str):
-                        content = json.dumps(content)
-                    provenant.add_turn(sid, role="USER", content=content)
-                session_ok[0] = True
-            except Exception as exc:
-                print(f"[provenant] session create warning: {exc}", file=sys.stderr)
-
-        t = threading.Thread(target=_create_session, daemon=True)
-        t.start()
-
-        t0 = time.time()
-        try:
-            response = original_create(*args, **kwargs)
-        except Exception:
-            t.join(timeout=2)
-            if session_id[0] and not is_managed:
-                try:
-                    provenant.end_session(session_id[0], status="FAILED")
-                except Exception:
-                    pass
-            raise
-
-        latency_ms = int((time.time() - t0) * 1000)
-        t.join(timeout=5)
-
-        usage = getattr(response, "usage", None)
-        input_tokens: Optional[int] = getattr(usage, "prompt_tokens", None)
-        output_tokens: Optional[int] = getattr(usage, "completion_tokens", None)
-        choices = getattr(response, "choices", []) or []
-        assistant_text = ""
-        tool_calls_list: List[Dict] = []
-        if choices:
-            msg = getattr(choices[0], "message", None)
-            assistant_text = getattr(msg, "content", "") or ""
-            raw_tc = getattr(msg, "tool_calls", None) or []
-            tool_calls_list = [
-                {
-                    "id": getattr(tc, "id", None),
-                    "name": getattr(getattr(tc, "function", None), "name", None),
-                    "arguments": getattr(getattr(tc, "function", None), "arguments", None),
-                }
-                for tc in raw_tc
-            ]
-
-        def _record_and_end() -> None:
-            if not session_ok[0] or not session_id[0]:
-                return
-            try:
-                provenant.add_turn(
-                    session_id[0],
-                    role="ASSISTANT",
-                    content=assistant_text,
-                    tool_calls=tool_calls_list or None,
-                    latency_ms=latency_ms,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                )
-                if not is_managed:
-                    provenant.end_session(session_id[0])
-            except Exception as exc:
-                print(f"[provenant] turn/end warning: {exc}", file=sys.stderr)
-
-        threading.Thread(target=_record_and_end, daemon=True).start()
-        return response
-
-    client.chat.completions.create = instrumented_create
+    """Patch AsyncAnthropic client.messages.create with an async def wrapper."""
+    client.messages.create = _make_async_instrumenter(
+        client.messages.create,
+        _bind_record_call(provenant, agent_id, session_opts),
+        _ANTHROPIC_OPS,
+    )
     return client
 
 
-# ── Anthropic async instrumentation ──────────────────────────────────────────
+# ── OpenAI instrumentation ───────────────────────────────────────────────────
 
-def _instrument_anthropic_async(
+def _instrument_openai(
     client: Any,
     provenant: ProvenantClient,
     agent_id: str,
     session_opts: Dict,
 ) -> Any:
-    """Patch AsyncAnthropic client.messages.create with an async def wrapper."""
-    original_create = client.messages.create
-
-    async def instrumented_create(*args: Any, **kwargs: Any) -> Any:
-        existing_sid = _active_session.get()
-        is_managed = existing_sid is not None
-        messages = kwargs.get("messages", [])
-
-        async def _to_thread(fn: Any, *a: Any, **kw: Any) -> Any:
-            if hasattr(asyncio, "to_thread"):
-                return await asyncio.to_thread(fn, *a, **kw)
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, lambda: fn(*a, **kw))
-
-        session_id: Optional[str] = existing_sid
-        last_user = next(
-            (m for m in reversed(messages) if isinstance(m, dict) and m.get("role") == "user"),
-            None,
-        )
-        tool_results = _detect_anthropic_tool_results(messages)
-
-        try:
-            if not is_managed:
-                s = await _to_thread(provenant.create_session, agent_id=agent_id, **session_opts)
-                session_id = s["id"]
-            if session_id:
-                if tool_results:
-                    await _to_thread(
-                        provenant.add_turn, session_id, role="TOOL", content=json.dumps(tool_results)
-                    )
-                if last_user:
-                    content = last_user.get("content", "")
-                    if not isinstance(content, str):
-                        content = json.dumps(content)
-                    await _to_thread(provenant.add_turn, session_id, role="USER", content=content)
-        except Exception as exc:
-            print(f"[provenant] async session create warning: {exc}", file=sys.stderr)
-
-        t0 = time.time()
-        try:
-            response = await original_create(*args, **kwargs)
-        except Exception:
-            if session_id and not is_managed:
-                try:
-                    await _to_thread(provenant.end_session, session_id, status="FAILED")
-                except Exception:
-                    pass
-            raise
-
-        latency_ms = int((time.time() - t0) * 1000)
-        tool_calls = _extract_anthropic_tool_calls(response)
-        assistant_text = _extract_anthropic_text(response)
-        usage = getattr(response, "usage", None)
-        input_tokens = getattr(usage, "input_tokens", None)
-        output_tokens = getattr(usage, "output_tokens", None)
-        _sid = session_id
-
-        async def _record() -> None:
-            if not _sid:
-                return
-            try:
-                await _to_thread(
-                    provenant.add_turn,
-                    _sid,
-                    role="ASSISTANT",
-                    content=assistant_text,
-                    tool_calls=tool_calls or None,
-                    latency_ms=latency_ms,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                )
-                if not is_managed:
-                    await _to_thread(provenant.end_session, _sid)
-            except Exception as exc:
-                print(f"[provenant] async record warning: {exc}", file=sys.stderr)
-
-        asyncio.create_task(_record())
-        return response
-
-    client.messages.create = instrumented_create
+    """
+    Monkey-patch client.chat.completions.create to automatically record
+    sessions. Returns the original client (modified in-place).
+    """
+    client.chat.completions.create = _make_instrumenter(
+        client.chat.completions.create,
+        _bind_record_call(provenant, agent_id, session_opts),
+        _OPENAI_OPS,
+    )
     return client
 
 
-# ── OpenAI async instrumentation ─────────────────────────────────────────────
-
 def _instrument_openai_async(
     client: Any,
     provenant: ProvenantClient,
@@ -812,100 +1255,23 @@ def _instrument_openai_async(
     session_opts: Dict,
 ) -> Any:
     """Patch AsyncOpenAI client.chat.completions.create with an async def wrapper."""
-    original_create = client.chat.completions.create
-
-    async def instrumented_create(*args: Any, **kwargs: Any) -> Any:
-        existing_sid = _active_session.get()
-        is_managed = existing_sid is not None
-        messages = kwargs.get("messages", [])
-
-        async def _to_thread(fn: Any, *a: Any, **kw: Any) -> Any:
-            if hasattr(asyncio, "to_thread"):
-                return await asyncio.to_thread(fn, *a, **kw)
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, lambda: fn(*a, **kw))
-
-        session_id: Optional[str] = existing_sid
-        tool_result_msgs = _detect_openai_tool_results(messages)
-        last_user = next(
-            (m for m in reversed(messages) if isinstance(m, dict) and m.get("role") == "user"),
-            None,
-        )
-
-        try:
-            if not is_managed:
-                s = await _to_thread(provenant.create_session, agent_id=agent_id, **session_opts)
-                session_id = s["id"]
-            if session_id:
-                for tr in tool_result_msgs:
-                    content = tr.get("content", "")
-                    if not isinstance(content, str):
-                        content = json.dumps(content)
-                    await _to_thread(provenant.add_turn, session_id, role="TOOL", content=content)
-                if last_user:
-                    content = last_user.get("content", "")
-                    if not isinstance(content, str):
-                        content = json.dumps(content)
-                    await _to_thread(provenant.add_turn, session_id, role="USER", content=content)
-        except Exception as exc:
-            print(f"[provenant] async session create warning: {exc}", file=sys.stderr)
-
-        t0 = time.time()
-        try:
-            response = await original_create(*args, **kwargs)
-        except Exception:
-            if session_id and not is_managed:
-                try:
-                    await _to_thread(provenant.end_session, session_id, status="FAILED")
-                except Exception:
-                    pass
-            raise
+    client.chat.completions.create = _make_async_instrumenter(
+        client.chat.completions.create,
+        _bind_record_call(provenant, agent_id, session_opts),
+        _OPENAI_OPS,
+    )
+    return client
 
-        latency_ms = int((time.time() - t0) * 1000)
-        usage = getattr(response, "usage", None)
-        input_tokens = getattr(usage, "prompt_tokens", None)
-        output_tokens = getattr(usage, "completion_tokens", None)
-        choices = getattr(response, "choices", []) or []
-        assistant_text = ""
-        tool_calls_list: List[Dict] = []
-        if choices:
-            msg = getattr(choices[0], "message", None)
-            assistant_text = getattr(msg, "content", "") or ""
-            raw_tc = getattr(msg, "tool_calls", None) or []
-            tool_calls_list = [
-                {
-                    "id": getattr(tc, "id", None),
-                    "name": getattr(getattr(tc, "function", None), "name", None),
-                    "arguments": getattr(getattr(tc, "function", None), "arguments", None),
-                }
-                for tc in raw_tc
-            ]
-        _sid = session_id
-
-        async def _record() -> None:
-            if not _sid:
-                return
-            try:
-                await _to_thread(
-                    provenant.add_turn,
-                    _sid,
-                    role="ASSISTANT",
-                    content=assistant_text,
-                    tool_calls=tool_calls_list or None,
-                    latency_ms=latency_ms,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                )
-                if not is_managed:
-                    await _to_thread(provenant.end_session, _sid)
-            except Exception as exc:
-                print(f"[provenant] async record warning: {exc}", file=sys.stderr)
 
-        asyncio.create_task(_record())
-        return response
+_DISPATCH = {
+    ("anthropic", False): _instrument_anthropic,
+    ("anthropic", True): _instrument_anthropic_async,
+    ("openai", False): _instrument_openai,
+    ("openai", True): _instrument_openai_async,
+}
 
-    client.chat.completions.create = instrumented_create
-    return client
+# Clients already patched by instrument() — patching twice would stack wrappers
+_INSTRUMENTED: "weakref.WeakSet[Any]" = weakref.WeakSet()
 
 
 # ── Public API ────────────────────────────────────────────────────────────────
@@ -952,7 +1318,7 @@ def instrument(
         async_client = instrument(anthropic.AsyncAnthropic(), ...)
         response = await async_client.messages.create(...)
 
-    **Streaming** is buffered — full response collected, then recorded::
+    **Streaming** chunks pass straight through; the full text is recorded after::
 
         for chunk in client.messages.create(..., stream=True):
             print(chunk)  # real chunks; Provenant records after
@@ -961,13 +1327,35 @@ def instrument(
             for text in stream.text_stream:
                 print(text)  # Provenant records when context exits
 
-    Provenant API failures are NEVER raised — logged to stderr only.
+    Provenant API failures are NEVER raised — they are logged as warnings on
+    the ``provenant`` logger.
     """
+    try:
+        if client in _INSTRUMENTED:
+            return client
+    except TypeError:
+        pass  # not weak-referenceable; no idempotency guard
+
+    module = (type(client).__module__ or "").lower()
+    qualname = (type(client).__qualname__ or "").lower()
+    identifier = f"{module}.{qualname}"
+    if "anthropic" in identifier:
+        provider = "anthropic"
+    elif "openai" in identifier:
+        provider = "openai"
+    else:
+        raise ValueError(
+            f"[provenant] Unsupported client type: {type(client).__name__}. "
+            "Supported: anthropic.Anthropic, anthropic.AsyncAnthropic, "
+            "openai.OpenAI, openai.AsyncOpenAI"
+        )
+    patch = _DISPATCH[(provider, "async" in qualname)]
+
     provenant = ProvenantClient(base_url=base_url, api_key=api_key, timeout=timeout)
 
     # Resolve agent_id: UUID → use directly; name → get or create
     resolved_id = (
-        agent_id if _UUID_RE.match(agent_id) else provenant.get_or_create_agent(agent_id)
+        agent_id if _is_uuid(agent_id) else provenant.get_or_create_agent(agent_id)
     )
 
     # Build session opts dict (drop None values to avoid sending nulls)
@@ -980,23 +1368,9 @@ def instrument(
         }.items() if v is not None
     }
 
-    module = (type(client).__module__ or "").lower()
-    qualname = (type(client).__qualname__ or "").lower()
-    identifier = f"{module}.{qualname}"
-    is_async = "async" in qualname
-
-    if "anthropic" in identifier:
-        if is_async:
-            return _instrument_anthropic_async(client, provenant, resolved_id, _session_opts)
-        return _instrument_anthropic(client, provenant, resolved_id, _session_opts)
-
-    if "openai" in identifier:
-        if is_async:
-            return _instrument_openai_async(client, provenant, resolved_id, _session_opts)
-        return _instrument_openai(client, provenant, resolved_id, _session_opts)
-
-    raise ValueError(
-        f"[provenant] Unsupported client type: {type(client).__name__}. "
-        "Supported: anthropic.Anthropic, anthropic.AsyncAnthropic, "
-        "openai.OpenAI, openai.AsyncOpenAI"
-    )
+    patch(client, provenant, resolved_id, _session_opts)
+    try:
+        _INSTRUMENTED.add(client)
+    except TypeError:
+        pass
+    return client